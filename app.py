@@ -3,114 +3,308 @@ Calendar Management System - Backend API
 Main Flask application for handling calendar events
 """
 
-from flask import Flask, request, jsonify, send_from_directory
-from datetime import datetime, timedelta
-import pytz
+from flask import Flask, request
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import atexit
+import hashlib
+import orjson
 import sqlite3
 import os
+import re
+import sys
+import threading
 from typing import List, Dict, Optional, Tuple
 from nlp_parser import parse_natural_language, format_parsed_result
 
 app = Flask(__name__, static_folder='static', static_url_path='')
 
+# Browser cache lifetime for static assets, in seconds
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = int(os.environ.get('STATIC_MAX_AGE', 31536000))
+# Hand static file bodies to a fronting server that understands X-Sendfile
+app.config['USE_X_SENDFILE'] = os.environ.get('USE_X_SENDFILE') == '1'
+
+def _json(obj, status: int = 200):
+    """Build a JSON response with orjson (serializes datetimes natively)"""
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
+
 # Database file
 DATABASE = 'calendar.db'
 
-def get_db():
-    """Get database connection"""
-    conn = sqlite3.connect(DATABASE)
+# UTC tzinfo singleton
+_UTC = dt_timezone.utc
+
+@lru_cache(maxsize=128)
+def _zone(name: str) -> ZoneInfo:
+    """Load a ZoneInfo once per timezone name"""
+    return ZoneInfo(name)
+
+def _tz(name: str) -> ZoneInfo:
+    """Get a cached ZoneInfo for a timezone name"""
+    # JSON bodies can carry null or a list here; reject them like unknown names
+    # (ZoneInfo raises TypeError, and lru_cache cannot hash a list)
+    if not isinstance(name, str):
+        raise ValueError(f'Timezone name must be a string, not {type(name).__name__}')
+    return _zone(name)
+
+# Per-thread database connections, keyed by owning thread for cleanup
+_local = threading.local()
+_connections: Dict[threading.Thread, sqlite3.Connection] = {}
+_connections_lock = threading.Lock()
+
+def _format_epoch(ts: float, tz_name: str) -> str:
+    """SQL function fmt_tz: format epoch seconds as ISO string in a timezone"""
+    # ts keeps its fraction, so the result carries the same microseconds as
+    # the stored UTC string (and the UTC fast path that reuses it)
+    return datetime.fromtimestamp(ts, _tz(tz_name)).isoformat()
+
+def _connect() -> sqlite3.Connection:
+    """Open a new database connection in autocommit mode"""
+    conn = sqlite3.connect(DATABASE, detect_types=0, check_same_thread=False, isolation_level=None)
     conn.row_factory = sqlite3.Row
+    # Set first so switching the journal mode waits on a locked database
+    conn.execute('PRAGMA busy_timeout=5000')
+    # WAL avoids an fsync per commit; mmap serves reads from the page cache
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA wal_autocheckpoint=1000')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')
+    conn.create_function('fmt_tz', 2, _format_epoch, deterministic=True)
+    return conn
+
+def get_db() -> sqlite3.Connection:
+    """Get the database connection for the current thread"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = _connect()
+        _local.conn = conn
+        with _connections_lock:
+            # Close connections left behind by threads that have exited
+            for thread in [t for t in _connections if not t.is_alive()]:
+                _connections.pop(thread).close()
+            _connections[threading.current_thread()] = conn
     return conn
 
+def _close_all():
+    """Close every open per-thread connection"""
+    with _connections_lock:
+        for conn in _connections.values():
+            conn.close()
+        _connections.clear()
+
+atexit.register(_close_all)
+
+def query_dicts(query: str, params: List) -> List[Dict]:
+    """Run a query on this thread's connection and return rows as plain dicts"""
+    # Plain tuples zipped with the column names skip building a sqlite3.Row per row
+    cursor = get_db().cursor()
+    cursor.row_factory = None
+    cursor.execute(query, params)
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+@contextmanager
+def transaction(conn: sqlite3.Connection):
+    """Run a block in a BEGIN IMMEDIATE transaction so writers serialize"""
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    else:
+        conn.execute('COMMIT')
+
 def init_db():
     """Initialize database with events table"""
-    conn = get_db()
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            description TEXT,
-            start_time_utc TEXT NOT NULL,
-            end_time_utc TEXT NOT NULL,
-            timezone TEXT NOT NULL,
-            created_at TEXT NOT NULL
-        )
-    ''')
-    conn.commit()
+    # Use a private connection so none is left open in a pre-fork parent
+    conn = _connect()
+    with transaction(conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                description TEXT,
+                start_time_utc TEXT NOT NULL,
+                end_time_utc TEXT NOT NULL,
+                timezone TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                start_ts REAL,
+                end_ts REAL,
+                created_ts REAL
+            )
+        ''')
+        
+        # Add epoch-second columns to databases created before they existed
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(events)')}
+        for column in ('start_ts', 'end_ts', 'created_ts'):
+            if column not in columns:
+                conn.execute(f'ALTER TABLE events ADD COLUMN {column} REAL')
+        
+        # Backfill in Python so fractional seconds convert exactly as for new rows
+        missing = conn.execute('''
+            SELECT id, start_time_utc, end_time_utc, created_at
+            FROM events
+            WHERE start_ts IS NULL OR end_ts IS NULL OR created_ts IS NULL
+        ''').fetchall()
+        conn.executemany('''
+            UPDATE events SET start_ts = ?, end_ts = ?, created_ts = ? WHERE id = ?
+        ''', [[to_epoch(parse_iso_datetime(row['start_time_utc'])),
+               to_epoch(parse_iso_datetime(row['end_time_utc'])),
+               to_epoch(parse_iso_datetime(row['created_at'])),
+               row['id']] for row in missing])
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_events_start_ts ON events(start_ts)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_events_range ON events(end_ts, start_ts)')
     conn.close()
 
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts the 'Z' suffix natively on 3.11+
+    parse_iso_datetime = datetime.fromisoformat
+else:
+    def parse_iso_datetime(dt_str: str) -> datetime:
+        """Parse ISO datetime string, accepting a trailing 'Z' for UTC"""
+        if dt_str.endswith('Z'):
+            return datetime.fromisoformat(dt_str[:-1] + '+00:00')
+        return datetime.fromisoformat(dt_str)
+
+def localize(dt: datetime, tz: ZoneInfo) -> datetime:
+    """Attach a timezone to a naive wall time, taking standard time when it is ambiguous"""
+    # replace() alone uses fold=0, the first occurrence of a repeated wall time.
+    # pytz's localize() took the later one unless only the earlier is outside
+    # DST, so keep that; times skipped by a DST gap keep fold=0, as with pytz
+    aware = dt.replace(tzinfo=tz)
+    later = aware.replace(fold=1)
+    ambiguous = (aware.utcoffset() != later.utcoffset()
+                 and aware.astimezone(_UTC).astimezone(tz).replace(tzinfo=None) == dt)
+    if ambiguous and not (later.dst() and not aware.dst()):
+        return later
+    return aware
+
 def parse_datetime_with_timezone(dt_str: str, tz_str: str) -> datetime:
     """Parse datetime string with timezone"""
     try:
-        tz = pytz.timezone(tz_str)
-        
-        # Normalize the datetime string
-        dt_str_normalized = dt_str.replace('Z', '+00:00')
-        
-        # Try to parse the datetime
-        try:
-            dt = datetime.fromisoformat(dt_str_normalized)
-        except ValueError:
-            # If that fails, try the original string
-            dt = datetime.fromisoformat(dt_str)
+        tz = _tz(tz_str)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Invalid timezone '{tz_str}': {e}")
+    
+    try:
+        dt = parse_iso_datetime(dt_str)
         
         # If datetime is naive (no timezone), localize it to the specified timezone
         if dt.tzinfo is None:
-            dt = tz.localize(dt)
+            dt = localize(dt, tz)
         
         # Convert to UTC
-        return dt.astimezone(pytz.UTC)
+        return dt.astimezone(_UTC)
     except ValueError as e:
         raise ValueError(f"Invalid datetime format '{dt_str}': {e}")
-    except pytz.UnknownTimeZoneError as e:
-        raise ValueError(f"Invalid timezone '{tz_str}': {e}")
     except Exception as e:
         raise ValueError(f"Error parsing datetime: {e}")
 
 def format_datetime_utc(dt_utc: datetime) -> str:
     """Format UTC datetime as ISO string"""
-    return dt_utc.isoformat().replace('+00:00', 'Z')
+    # Fixed layout, so build it directly rather than isoformat() + replace()
+    formatted = (f'{dt_utc.year:04d}-{dt_utc.month:02d}-{dt_utc.day:02d}'
+                 f'T{dt_utc.hour:02d}:{dt_utc.minute:02d}:{dt_utc.second:02d}')
+    if dt_utc.microsecond:
+        formatted += f'.{dt_utc.microsecond:06d}'
+    return formatted + 'Z'
+
+def to_epoch(dt: datetime) -> float:
+    """Convert aware datetime (in any timezone) to unix epoch seconds"""
+    # Kept fractional: microseconds survive the round trip through a double,
+    # so comparisons match the stored ISO strings exactly
+    return dt.timestamp()
+
+# Two intervals overlap when each starts before the other ends
+CONFLICTS_QUERY = '''
+    SELECT id, title, start_time_utc, end_time_utc, timezone
+    FROM events
+    WHERE start_ts < ? AND end_ts > ? AND id IS NOT ?
+'''
+
+INSERT_EVENT_QUERY = '''
+    INSERT INTO events (title, description, start_time_utc, end_time_utc, timezone, created_at,
+                        start_ts, end_ts, created_ts)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Event rows with start/end already formatted in the timezone bound twice up front
+EVENTS_QUERY = '''
+    SELECT id, title, description,
+           fmt_tz(start_ts, ?) AS start_time, fmt_tz(end_ts, ?) AS end_time,
+           timezone, start_time_utc, end_time_utc
+    FROM events
+'''
+
+# Viewing in UTC: the stored strings only need their offset spelled out
+EVENTS_IN_UTC_QUERY = '''
+    SELECT id, title, description,
+           replace(start_time_utc, 'Z', '+00:00') AS start_time,
+           replace(end_time_utc, 'Z', '+00:00') AS end_time,
+           timezone, start_time_utc, end_time_utc
+    FROM events
+'''
+
+# fields=utc: clients that render UTC themselves skip the local times
+EVENTS_UTC_FIELDS_QUERY = '''
+    SELECT id, title, description, timezone, start_time_utc, end_time_utc
+    FROM events
+'''
+
+def events_query(timezone: str, fields: Optional[str]) -> Tuple[str, List]:
+    """Pick the event SELECT for the requested output, with its leading params"""
+    if fields == 'utc':
+        return EVENTS_UTC_FIELDS_QUERY, []
+    if timezone == 'UTC':
+        return EVENTS_IN_UTC_QUERY, []
+    return EVENTS_QUERY, [timezone, timezone]
 
 def check_conflicts(start_utc: datetime, end_utc: datetime, exclude_id: Optional[int] = None) -> List[Dict]:
     """Check for overlapping events"""
     if start_utc >= end_utc:
         return [{"error": "Start time must be before end time"}]
     
-    conn = get_db()
-    query = '''
-        SELECT id, title, start_time_utc, end_time_utc, timezone
-        FROM events
-        WHERE (
-            (start_time_utc < ? AND end_time_utc > ?) OR
-            (start_time_utc < ? AND end_time_utc > ?) OR
-            (start_time_utc >= ? AND end_time_utc <= ?)
-        )
-    '''
-    params = [format_datetime_utc(end_utc), format_datetime_utc(start_utc),
-              format_datetime_utc(start_utc), format_datetime_utc(end_utc),
-              format_datetime_utc(start_utc), format_datetime_utc(end_utc)]
-    
-    if exclude_id:
-        query += ' AND id != ?'
-        params.append(exclude_id)
-    
-    cursor = conn.execute(query, params)
-    conflicts = []
-    for row in cursor.fetchall():
-        conflicts.append({
-            'id': row['id'],
-            'title': row['title'],
-            'start_time_utc': row['start_time_utc'],
-            'end_time_utc': row['end_time_utc'],
-            'timezone': row['timezone']
-        })
-    conn.close()
-    return conflicts
+    # Without exclude_id the filter becomes 'id IS NOT NULL', which always holds,
+    # so a single statement serves both cases from the prepared statement cache
+    return query_dicts(CONFLICTS_QUERY, [to_epoch(end_utc), to_epoch(start_utc), exclude_id or None])
+
+# Local stylesheet/script references in the main page, e.g. href="style.css"
+_ASSET_REF_RE = re.compile(rb'((?:href|src)=")([\w.-]+\.(?:css|js))(")')
 
+def _render_index() -> Tuple[bytes, str]:
+    """Read the main HTML page, version its asset URLs by content hash and compute its ETag"""
+    def versioned(match):
+        path = os.path.join(app.static_folder, match.group(2).decode())
+        if not os.path.isfile(path):
+            return match.group(0)
+        with open(path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:12]
+        return match.group(1) + match.group(2) + b'?v=' + digest.encode() + match.group(3)
+    
+    with open(os.path.join(app.static_folder, 'index.html'), 'rb') as f:
+        body = _ASSET_REF_RE.sub(versioned, f.read())
+    return body, hashlib.sha1(body).hexdigest()
+
+# Rendered once; asset URLs change with their content, so long max-age is safe
+_index_page = lru_cache(maxsize=1)(_render_index)
+
+# The page's own URL is claimed too; otherwise the static route would serve the
+# raw file, with unversioned asset links, under the long max-age
 @app.route('/')
+@app.route('/index.html')
 def index():
     """Serve the main HTML page"""
-    return send_from_directory('static', 'index.html')
+    # In debug mode re-render each time so edits to the page and assets show up
+    body, etag = _render_index() if app.debug else _index_page()
+    response = app.response_class(body, mimetype='text/html')
+    response.set_etag(etag)
+    # Always revalidate so a new deployment is seen; unchanged pages get a 304
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/api/events', methods=['GET'])
 def get_events():
@@ -120,51 +314,31 @@ def get_events():
     timezone = request.args.get('timezone', 'UTC')
     
     try:
-        tz = pytz.timezone(timezone)
-    except pytz.UnknownTimeZoneError:
-        return jsonify({'error': f'Invalid timezone: {timezone}'}), 400
+        tz = _tz(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        return _json({'error': f'Invalid timezone: {timezone}'}, 400)
     
-    conn = get_db()
-    query = 'SELECT * FROM events WHERE 1=1'
-    params = []
+    query, params = events_query(timezone, request.args.get('fields'))
+    query += ' WHERE 1=1'
     
     if start_date:
-        start_dt = datetime.fromisoformat(start_date)
+        start_dt = parse_iso_datetime(start_date)
         if start_dt.tzinfo is None:
-            start_dt = tz.localize(start_dt)
-        start_utc = start_dt.astimezone(pytz.UTC)
-        query += ' AND end_time_utc >= ?'
-        params.append(format_datetime_utc(start_utc))
+            start_dt = localize(start_dt, tz)
+        query += ' AND end_ts >= ?'
+        params.append(to_epoch(start_dt))
     
     if end_date:
-        end_dt = datetime.fromisoformat(end_date)
+        end_dt = parse_iso_datetime(end_date)
         if end_dt.tzinfo is None:
-            end_dt = tz.localize(end_dt)
-        end_utc = end_dt.astimezone(pytz.UTC)
-        query += ' AND start_time_utc <= ?'
-        params.append(format_datetime_utc(end_utc))
+            end_dt = localize(end_dt, tz)
+        query += ' AND start_ts <= ?'
+        params.append(to_epoch(end_dt))
     
-    query += ' ORDER BY start_time_utc ASC'
-    cursor = conn.execute(query, params)
+    query += ' ORDER BY start_ts ASC'
+    events = query_dicts(query, params)
     
-    events = []
-    for row in cursor.fetchall():
-        start_utc = datetime.fromisoformat(row['start_time_utc'].replace('Z', '+00:00'))
-        end_utc = datetime.fromisoformat(row['end_time_utc'].replace('Z', '+00:00'))
-        
-        events.append({
-            'id': row['id'],
-            'title': row['title'],
-            'description': row['description'],
-            'start_time': start_utc.astimezone(tz).isoformat(),
-            'end_time': end_utc.astimezone(tz).isoformat(),
-            'timezone': row['timezone'],
-            'start_time_utc': row['start_time_utc'],
-            'end_time_utc': row['end_time_utc']
-        })
-    
-    conn.close()
-    return jsonify(events)
+    return _json(events)
 
 @app.route('/api/events/week', methods=['GET'])
 def get_weekly_events():
@@ -173,9 +347,9 @@ def get_weekly_events():
     timezone = request.args.get('timezone', 'UTC')
     
     try:
-        tz = pytz.timezone(timezone)
-    except pytz.UnknownTimeZoneError:
-        return jsonify({'error': f'Invalid timezone: {timezone}'}), 400
+        tz = _tz(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        return _json({'error': f'Invalid timezone: {timezone}'}, 400)
     
     if not start_date_str:
         # Default to current week in the specified timezone
@@ -188,47 +362,25 @@ def get_weekly_events():
         try:
             date_parts = start_date_str.split('-')
             year, month, day = int(date_parts[0]), int(date_parts[1]), int(date_parts[2])
-            start_of_week = tz.localize(datetime(year, month, day, 0, 0, 0))
+            start_of_week = localize(datetime(year, month, day, 0, 0, 0), tz)
         except (ValueError, IndexError):
             # Fallback to isoformat parsing
-            start_of_week = datetime.fromisoformat(start_date_str)
+            start_of_week = parse_iso_datetime(start_date_str)
             if start_of_week.tzinfo is None:
-                start_of_week = tz.localize(start_of_week)
+                start_of_week = localize(start_of_week, tz)
             start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
     
     end_of_week = start_of_week + timedelta(days=7)
     
-    start_utc = start_of_week.astimezone(pytz.UTC)
-    end_utc = end_of_week.astimezone(pytz.UTC)
+    query, params = events_query(timezone, request.args.get('fields'))
+    events = query_dicts(query + '''
+        WHERE end_ts >= ? AND start_ts < ?
+        ORDER BY start_ts ASC
+    ''', params + [to_epoch(start_of_week), to_epoch(end_of_week)])
     
-    conn = get_db()
-    cursor = conn.execute('''
-        SELECT * FROM events
-        WHERE end_time_utc >= ? AND start_time_utc < ?
-        ORDER BY start_time_utc ASC
-    ''', [format_datetime_utc(start_utc), format_datetime_utc(end_utc)])
-    
-    events = []
-    for row in cursor.fetchall():
-        start_event_utc = datetime.fromisoformat(row['start_time_utc'].replace('Z', '+00:00'))
-        end_event_utc = datetime.fromisoformat(row['end_time_utc'].replace('Z', '+00:00'))
-        
-        events.append({
-            'id': row['id'],
-            'title': row['title'],
-            'description': row['description'],
-            'start_time': start_event_utc.astimezone(tz).isoformat(),
-            'end_time': end_event_utc.astimezone(tz).isoformat(),
-            'timezone': row['timezone'],
-            'start_time_utc': row['start_time_utc'],
-            'end_time_utc': row['end_time_utc']
-        })
-    
-    conn.close()
-    
-    return jsonify({
-        'start_of_week': start_of_week.isoformat(),
-        'end_of_week': end_of_week.isoformat(),
+    return _json({
+        'start_of_week': start_of_week,
+        'end_of_week': end_of_week,
         'events': events
     })
 
@@ -238,7 +390,7 @@ def create_event():
     data = request.get_json()
     
     if not data:
-        return jsonify({'error': 'No data provided'}), 400
+        return _json({'error': 'No data provided'}, 400)
     
     title = data.get('title')
     description = data.get('description', '')
@@ -247,47 +399,125 @@ def create_event():
     timezone = data.get('timezone', 'UTC')
     
     if not all([title, start_time, end_time]):
-        return jsonify({'error': 'Missing required fields: title, start_time, end_time'}), 400
+        return _json({'error': 'Missing required fields: title, start_time, end_time'}, 400)
+    
+    try:
+        tz = _tz(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        return _json({'error': f'Invalid timezone: {timezone}'}, 400)
     
     try:
-        tz = pytz.timezone(timezone)
         start_utc = parse_datetime_with_timezone(start_time, timezone)
         end_utc = parse_datetime_with_timezone(end_time, timezone)
-    except (ValueError, pytz.UnknownTimeZoneError) as e:
-        return jsonify({'error': str(e)}), 400
-    
-    # Check for conflicts
-    conflicts = check_conflicts(start_utc, end_utc)
-    if conflicts:
-        if 'error' in conflicts[0]:
-            return jsonify(conflicts[0]), 400
-        else:
-            # Real conflicts found
-            return jsonify({
-                'error': 'Event conflicts with existing events',
-                'conflicts': conflicts
-            }), 409
+    except ValueError as e:
+        return _json({'error': str(e)}, 400)
     
-    # Create event
     conn = get_db()
-    created_at = datetime.now(pytz.UTC)
-    conn.execute('''
-        INSERT INTO events (title, description, start_time_utc, end_time_utc, timezone, created_at)
-        VALUES (?, ?, ?, ?, ?, ?)
-    ''', [title, description, format_datetime_utc(start_utc), format_datetime_utc(end_utc), timezone, format_datetime_utc(created_at)])
-    conn.commit()
-    event_id = conn.lastrowid
-    conn.close()
-    
-    return jsonify({
+    with transaction(conn):
+        # Check for conflicts
+        conflicts = check_conflicts(start_utc, end_utc)
+        if conflicts:
+            if 'error' in conflicts[0]:
+                return _json(conflicts[0], 400)
+            else:
+                # Real conflicts found
+                return _json({
+                    'error': 'Event conflicts with existing events',
+                    'conflicts': conflicts
+                }, 409)
+        
+        # Create event
+        created_at = datetime.now(_UTC)
+        cursor = conn.execute(INSERT_EVENT_QUERY, [
+            title, description, format_datetime_utc(start_utc), format_datetime_utc(end_utc), timezone,
+            format_datetime_utc(created_at), to_epoch(start_utc), to_epoch(end_utc), to_epoch(created_at)
+        ])
+        event_id = cursor.lastrowid
+    
+    return _json({
         'id': event_id,
         'title': title,
         'description': description,
-        'start_time': start_utc.astimezone(tz).isoformat(),
-        'end_time': end_utc.astimezone(tz).isoformat(),
+        'start_time': start_utc.astimezone(tz),
+        'end_time': end_utc.astimezone(tz),
         'timezone': timezone,
         'message': 'Event created successfully'
-    }), 201
+    }, 201)
+
+@app.route('/api/events/bulk', methods=['POST'])
+def create_events_bulk():
+    """Create several events in a single transaction"""
+    data = request.get_json()
+    
+    if not isinstance(data, dict) or not isinstance(data.get('events'), list) or not data['events']:
+        return _json({'error': 'No events provided'}, 400)
+    
+    created_at = datetime.now(_UTC)
+    events = []
+    for index, item in enumerate(data['events']):
+        if not isinstance(item, dict):
+            return _json({'error': 'Event must be an object', 'index': index}, 400)
+        
+        title = item.get('title')
+        start_time = item.get('start_time')
+        end_time = item.get('end_time')
+        timezone = item.get('timezone', 'UTC')
+        
+        if not all([title, start_time, end_time]):
+            return _json({'error': 'Missing required fields: title, start_time, end_time', 'index': index}, 400)
+        
+        try:
+            _tz(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            return _json({'error': f'Invalid timezone: {timezone}', 'index': index}, 400)
+        
+        try:
+            start_utc = parse_datetime_with_timezone(start_time, timezone)
+            end_utc = parse_datetime_with_timezone(end_time, timezone)
+        except ValueError as e:
+            return _json({'error': str(e), 'index': index}, 400)
+        
+        if start_utc >= end_utc:
+            return _json({'error': 'Start time must be before end time', 'index': index}, 400)
+        
+        events.append((index, title, item.get('description', ''), start_utc, end_utc, timezone))
+    
+    # Events in the batch must not overlap each other either
+    latest = None
+    for event in sorted(events, key=lambda e: e[3]):
+        if latest is not None and event[3] < latest[4]:
+            return _json({
+                'error': 'Event conflicts with another event in the batch',
+                'index': event[0],
+                'conflicts_with_index': latest[0]
+            }, 409)
+        if latest is None or event[4] > latest[4]:
+            latest = event
+    
+    conn = get_db()
+    with transaction(conn):
+        for index, _, _, start_utc, end_utc, _ in events:
+            conflicts = check_conflicts(start_utc, end_utc)
+            if conflicts:
+                return _json({
+                    'error': 'Event conflicts with existing events',
+                    'index': index,
+                    'conflicts': conflicts
+                }, 409)
+        
+        conn.executemany(INSERT_EVENT_QUERY, [
+            [title, description, format_datetime_utc(start_utc), format_datetime_utc(end_utc), timezone,
+             format_datetime_utc(created_at), to_epoch(start_utc), to_epoch(end_utc), to_epoch(created_at)]
+            for _, title, description, start_utc, end_utc, timezone in events
+        ])
+        # The write lock is held, so AUTOINCREMENT ids in the batch are contiguous
+        last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+    
+    first_id = last_id - len(events) + 1
+    return _json({
+        'ids': list(range(first_id, last_id + 1)),
+        'message': f'{len(events)} events created successfully'
+    }, 201)
 
 @app.route('/api/events/<int:event_id>', methods=['PUT'])
 def update_event(event_id):
@@ -295,15 +525,14 @@ def update_event(event_id):
     data = request.get_json()
     
     if not data:
-        return jsonify({'error': 'No data provided'}), 400
+        return _json({'error': 'No data provided'}, 400)
     
     conn = get_db()
     # Check if event exists
     cursor = conn.execute('SELECT * FROM events WHERE id = ?', [event_id])
     existing = cursor.fetchone()
     if not existing:
-        conn.close()
-        return jsonify({'error': 'Event not found'}), 404
+        return _json({'error': 'Event not found'}, 404)
     
     title = data.get('title', existing['title'])
     description = data.get('description', existing['description'])
@@ -312,49 +541,70 @@ def update_event(event_id):
     timezone = data.get('timezone', existing['timezone'])
     
     try:
-        tz = pytz.timezone(timezone)
+        tz = _tz(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        return _json({'error': f'Invalid timezone: {timezone}'}, 400)
+    
+    if not start_time and not end_time:
+        # Interval unchanged, so the event still fits among its neighbors;
+        # skip the conflict check and leave the stored times untouched
+        conn.execute('''
+            UPDATE events
+            SET title = ?, description = ?, timezone = ?
+            WHERE id = ?
+        ''', [title, description, timezone, event_id])
+        
+        return _json({
+            'id': event_id,
+            'title': title,
+            'description': description,
+            'start_time': parse_iso_datetime(existing['start_time_utc']).astimezone(tz),
+            'end_time': parse_iso_datetime(existing['end_time_utc']).astimezone(tz),
+            'timezone': timezone,
+            'message': 'Event updated successfully'
+        })
+    
+    try:
         if start_time:
             start_utc = parse_datetime_with_timezone(start_time, timezone)
         else:
-            start_utc = datetime.fromisoformat(existing['start_time_utc'].replace('Z', '+00:00'))
+            start_utc = parse_iso_datetime(existing['start_time_utc'])
         
         if end_time:
             end_utc = parse_datetime_with_timezone(end_time, timezone)
         else:
-            end_utc = datetime.fromisoformat(existing['end_time_utc'].replace('Z', '+00:00'))
-    except (ValueError, pytz.UnknownTimeZoneError) as e:
-        conn.close()
-        return jsonify({'error': str(e)}), 400
-    
-    # Check for conflicts (excluding current event)
-    conflicts = check_conflicts(start_utc, end_utc, exclude_id=event_id)
-    if conflicts:
-        if 'error' in conflicts[0]:
-            conn.close()
-            return jsonify(conflicts[0]), 400
-        else:
-            # Real conflicts found
-            conn.close()
-            return jsonify({
-                'error': 'Event conflicts with existing events',
-                'conflicts': conflicts
-            }), 409
-    
-    # Update event
-    conn.execute('''
-        UPDATE events
-        SET title = ?, description = ?, start_time_utc = ?, end_time_utc = ?, timezone = ?
-        WHERE id = ?
-    ''', [title, description, format_datetime_utc(start_utc), format_datetime_utc(end_utc), timezone, event_id])
-    conn.commit()
-    conn.close()
-    
-    return jsonify({
+            end_utc = parse_iso_datetime(existing['end_time_utc'])
+    except ValueError as e:
+        return _json({'error': str(e)}, 400)
+    
+    with transaction(conn):
+        # Check for conflicts (excluding current event)
+        conflicts = check_conflicts(start_utc, end_utc, exclude_id=event_id)
+        if conflicts:
+            if 'error' in conflicts[0]:
+                return _json(conflicts[0], 400)
+            else:
+                # Real conflicts found
+                return _json({
+                    'error': 'Event conflicts with existing events',
+                    'conflicts': conflicts
+                }, 409)
+        
+        # Update event
+        conn.execute('''
+            UPDATE events
+            SET title = ?, description = ?, start_time_utc = ?, end_time_utc = ?, timezone = ?,
+                start_ts = ?, end_ts = ?
+            WHERE id = ?
+        ''', [title, description, format_datetime_utc(start_utc), format_datetime_utc(end_utc), timezone,
+              to_epoch(start_utc), to_epoch(end_utc), event_id])
+    
+    return _json({
         'id': event_id,
         'title': title,
         'description': description,
-        'start_time': start_utc.astimezone(tz).isoformat(),
-        'end_time': end_utc.astimezone(tz).isoformat(),
+        'start_time': start_utc.astimezone(tz),
+        'end_time': end_utc.astimezone(tz),
         'timezone': timezone,
         'message': 'Event updated successfully'
     })
@@ -363,16 +613,14 @@ def update_event(event_id):
 def delete_event(event_id):
     """Delete an event"""
     conn = get_db()
-    cursor = conn.execute('SELECT id FROM events WHERE id = ?', [event_id])
-    if not cursor.fetchone():
-        conn.close()
-        return jsonify({'error': 'Event not found'}), 404
-    
-    conn.execute('DELETE FROM events WHERE id = ?', [event_id])
-    conn.commit()
-    conn.close()
+    with transaction(conn):
+        cursor = conn.execute('SELECT id FROM events WHERE id = ?', [event_id])
+        if not cursor.fetchone():
+            return _json({'error': 'Event not found'}, 404)
+        
+        conn.execute('DELETE FROM events WHERE id = ?', [event_id])
     
-    return jsonify({'message': 'Event deleted successfully'})
+    return _json({'message': 'Event deleted successfully'})
 
 @app.route('/api/nlp/parse', methods=['POST'])
 def parse_natural_language_endpoint():
@@ -380,7 +628,7 @@ def parse_natural_language_endpoint():
     data = request.get_json()
     
     if not data or 'text' not in data:
-        return jsonify({'error': 'No text provided'}), 400
+        return _json({'error': 'No text provided'}, 400)
     
     text = data.get('text')
     timezone = data.get('timezone', 'UTC')
@@ -388,13 +636,14 @@ def parse_natural_language_endpoint():
     try:
         parsed = parse_natural_language(text, timezone)
         formatted = format_parsed_result(parsed)
-        return jsonify(formatted)
+        return _json(formatted)
     except Exception as e:
-        return jsonify({'error': f'Failed to parse: {str(e)}'}), 400
+        return _json({'error': f'Failed to parse: {str(e)}'}, 400)
 
 if __name__ == '__main__':
     init_db()
     print("Database initialized")
     print("Starting server on http://127.0.0.1:5000")
-    app.run(debug=True, port=5000)
+    # Development server only; see wsgi.py for production deployment
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', port=5000)
 
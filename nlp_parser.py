@@ -3,9 +3,56 @@ Natural Language Processing for Calendar Event Creation
 Converts natural language text into structured event data
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 import re
-import pytz
+from zoneinfo import ZoneInfo
+
+# Title is usually everything before date/time keywords
+_TITLE_RE = re.compile(r'^(.+?)(?:\s+(?:tomorrow|today|next|on|at|from|until))')
+
+# Relative date keywords; the named group that matched identifies the keyword.
+# "next <weekday>" accepts full weekday names anywhere a substring would
+# ("next mondays"), and abbreviations only as whole words ("next mon", not "next month")
+_DATE_KEYWORD_RE = re.compile(
+    r'(?P<today>today)|(?P<tomorrow>tomorrow)|(?P<next_week>next week)'
+    r'|next (?P<weekday>monday|tuesday|wednesday|thursday|friday|saturday|sunday'
+    r'|(?:mon|tues|tue|wed|thurs|thur|thu|fri|sat|sun)\b)'
+)
+
+_WEEKDAY_MAP = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
+
+# Specific dates (MM/DD, Dec 30, December 30, 30 Dec, etc.)
+_DATE_PATTERNS = [
+    re.compile(r'(\d{1,2})[/-](\d{1,2})'),  # 12/30 or 12-30
+    re.compile(r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+(\d{1,2})'),  # Dec 30
+    re.compile(r'(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)'),  # 30 Dec
+]
+
+_MONTH_MAP = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# Time patterns (order matters - AM/PM patterns first)
+_TIME_PATTERNS = [(re.compile(pattern, re.IGNORECASE), has_ampm) for pattern, has_ampm in [
+    (r'(\d{1,2}):(\d{2})\s*(am|pm)', True),  # 2:30pm, 2:30 pm
+    (r'(\d{1,2})\s*(am|pm)', True),  # 2pm, 2 pm, 10am (no minutes)
+    (r'at\s+(\d{1,2}):(\d{2})', False),  # at 14:30 (24-hour format)
+    (r'at\s+(\d{1,2})', False),  # at 2 (default to PM if ambiguous)
+]]
+
+_DURATION_PATTERNS = [
+    re.compile(r'for\s+(\d+)\s*(min|minutes|hour|hours|hr|hrs)'),
+    re.compile(r'(\d+)\s*(min|minutes|hour|hours|hr|hrs)'),
+]
+
+def days_until_weekday(current_weekday, target_weekday):
+    """Calculate days until next occurrence of target weekday (0=Mon, 6=Sun)"""
+    days_ahead = target_weekday - current_weekday
+    if days_ahead <= 0:
+        days_ahead += 7  # Target day already passed this week, move to next week
+    return days_ahead
 
 def parse_natural_language(text, timezone_str='UTC'):
     """
@@ -20,6 +67,14 @@ def parse_natural_language(text, timezone_str='UTC'):
     """
     text = text.strip().lower()
     
+    # Relative dates only depend on the current day in the user's timezone,
+    # so the cache entry rolls over at local midnight
+    today_ordinal = datetime.now(ZoneInfo(timezone_str)).toordinal()
+    return dict(_parse_natural_language(text, today_ordinal))
+
+@lru_cache(maxsize=1024)
+def _parse_natural_language(text, today_ordinal):
+    """Parse normalized text relative to the given day; returns an immutable item tuple"""
     # Initialize result
     result = {
         'title': '',
@@ -32,95 +87,62 @@ def parse_natural_language(text, timezone_str='UTC'):
         'confidence': 0
     }
     
-    # Extract title (usually everything before date/time keywords)
-    title_match = re.match(r'^(.+?)(?:\s+(?:tomorrow|today|next|on|at|from|until))', text)
+    # Extract title (usually everything before date/time keywords);
+    # kept lower-case here and title-cased by format_parsed_result
+    title_match = _TITLE_RE.match(text)
     if title_match:
-        result['title'] = title_match.group(1).strip().title()
+        result['title'] = title_match.group(1)
     else:
-        # If no date/time keywords, try to extract title before common patterns
-        title_match = re.match(r'^(.+?)(?:\s+(?:at|from|until)\s+)', text)
-        if title_match:
-            result['title'] = title_match.group(1).strip().title()
-        else:
-            result['title'] = text.split(' at ')[0].strip().title()
+        # No keyword on the first line ('.' stops at newlines): fall back
+        # to everything before ' at ', which is the whole text if absent
+        result['title'] = text.split(' at ')[0].strip()
     
     # Extract date references
-    today = datetime.now(pytz.timezone(timezone_str))
+    today = date.fromordinal(today_ordinal)
     current_weekday = today.weekday()  # 0=Monday, 6=Sunday
     
-    # Helper function to calculate days until next weekday
-    def days_until_weekday(target_weekday):
-        """Calculate days until next occurrence of target weekday (0=Mon, 6=Sun)"""
-        days_ahead = target_weekday - current_weekday
-        if days_ahead <= 0:
-            days_ahead += 7  # Target day already passed this week, move to next week
-        return days_ahead
+    # Date patterns: collect keywords in one pass, then apply them in priority order
+    date_keywords = {}
+    for match in _DATE_KEYWORD_RE.finditer(text):
+        date_keywords.setdefault(match.lastgroup, []).append(match)
     
-    # Date patterns
-    if 'today' in text:
-        result['start_date'] = today.date()
+    if 'today' in date_keywords:
+        result['start_date'] = today
         result['confidence'] += 0.3
-    elif 'tomorrow' in text:
-        result['start_date'] = (today + timedelta(days=1)).date()
+    elif 'tomorrow' in date_keywords:
+        result['start_date'] = today + timedelta(days=1)
         result['confidence'] += 0.3
-    elif 'next week' in text:
+    elif 'next_week' in date_keywords:
         days_until_next_week = 7 - current_weekday
         if days_until_next_week == 0:
             days_until_next_week = 7
-        result['start_date'] = (today + timedelta(days=days_until_next_week)).date()
+        result['start_date'] = today + timedelta(days=days_until_next_week)
         result['confidence'] += 0.2
-    elif 'next monday' in text:
-        result['start_date'] = (today + timedelta(days=days_until_weekday(0))).date()
-        result['confidence'] += 0.3
-    elif 'next tuesday' in text:
-        result['start_date'] = (today + timedelta(days=days_until_weekday(1))).date()
-        result['confidence'] += 0.3
-    elif 'next wednesday' in text:
-        result['start_date'] = (today + timedelta(days=days_until_weekday(2))).date()
-        result['confidence'] += 0.3
-    elif 'next thursday' in text:
-        result['start_date'] = (today + timedelta(days=days_until_weekday(3))).date()
-        result['confidence'] += 0.3
-    elif 'next friday' in text:
-        result['start_date'] = (today + timedelta(days=days_until_weekday(4))).date()
-        result['confidence'] += 0.3
-    elif 'next saturday' in text:
-        result['start_date'] = (today + timedelta(days=days_until_weekday(5))).date()
-        result['confidence'] += 0.3
-    elif 'next sunday' in text:
-        result['start_date'] = (today + timedelta(days=days_until_weekday(6))).date()
+    elif 'weekday' in date_keywords:
+        # Several "next <weekday>" phrases: the earliest in the week wins, Monday first
+        target_weekday = min(_WEEKDAY_MAP[match.group('weekday')[:3]] for match in date_keywords['weekday'])
+        result['start_date'] = today + timedelta(days=days_until_weekday(current_weekday, target_weekday))
         result['confidence'] += 0.3
     
     # Extract specific dates (MM/DD, Dec 30, December 30, 30 Dec, etc.)
-    date_patterns = [
-        r'(\d{1,2})[/-](\d{1,2})',  # 12/30 or 12-30
-        r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+(\d{1,2})',  # Dec 30
-        r'(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)',  # 30 Dec
-    ]
-    
-    month_map = {
-        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-        'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-    }
-    
-    for pattern in date_patterns:
-        match = re.search(pattern, text)
+    for pattern in _DATE_PATTERNS:
+        match = pattern.search(text)
         if match:
             try:
                 if '/' in match.group(0) or '-' in match.group(0):
                     month, day = int(match.group(1)), int(match.group(2))
                 else:
-                    if match.group(1).lower() in month_map:
-                        month = month_map[match.group(1).lower()]
+                    if match.group(1).lower() in _MONTH_MAP:
+                        month = _MONTH_MAP[match.group(1).lower()]
                         day = int(match.group(2))
                     else:
-                        month = month_map[match.group(2).lower()]
+                        month = _MONTH_MAP[match.group(2).lower()]
                         day = int(match.group(1))
                 
                 year = today.year
                 # If date has passed this year, assume next year
                 try_date = datetime(year, month, day).date()
-                if try_date < today.date():
+                if try_date < today:
                     year += 1
                 
                 result['start_date'] = datetime(year, month, day).date()
@@ -131,23 +153,15 @@ def parse_natural_language(text, timezone_str='UTC'):
     
     # Default to today if no date found
     if result['start_date'] is None:
-        result['start_date'] = today.date()
+        result['start_date'] = today
         result['confidence'] += 0.1
     
     result['end_date'] = result['start_date']
     
     # Extract time patterns (order matters - AM/PM patterns first)
-    time_patterns = [
-        (r'(\d{1,2}):(\d{2})\s*(am|pm)', True),  # 2:30pm, 2:30 pm
-        (r'(\d{1,2})\s*(am|pm)', True),  # 2pm, 2 pm, 10am (no minutes)
-        (r'at\s+(\d{1,2}):(\d{2})', False),  # at 14:30 (24-hour format)
-        (r'at\s+(\d{1,2})', False),  # at 2 (default to PM if ambiguous)
-    ]
-    
     time_found = False
-    for pattern_tuple in time_patterns:
-        pattern, has_ampm = pattern_tuple
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern, has_ampm in _TIME_PATTERNS:
+        match = pattern.search(text)
         if match:
             try:
                 groups = match.groups()
@@ -198,13 +212,8 @@ def parse_natural_language(text, timezone_str='UTC'):
         result['confidence'] += 0.1
     
     # Extract duration
-    duration_patterns = [
-        r'for\s+(\d+)\s*(min|minutes|hour|hours|hr|hrs)',
-        r'(\d+)\s*(min|minutes|hour|hours|hr|hrs)',
-    ]
-    
-    for pattern in duration_patterns:
-        match = re.search(pattern, text)
+    for pattern in _DURATION_PATTERNS:
+        match = pattern.search(text)
         if match:
             try:
                 duration_val = int(match.group(1))
@@ -236,12 +245,12 @@ def parse_natural_language(text, timezone_str='UTC'):
     else:
         result['end_time'] = result['start_time']
     
-    return result
+    return tuple(result.items())
 
 def format_parsed_result(result):
     """Format parsed result for display"""
     return {
-        'title': result['title'] or 'Untitled Event',
+        'title': result['title'].title() or 'Untitled Event',
         'start_date': result['start_date'].strftime('%Y-%m-%d') if result['start_date'] else None,
         'start_time': result['start_time'],
         'end_date': result['end_date'].strftime('%Y-%m-%d') if result['end_date'] else None,
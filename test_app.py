@@ -0,0 +1,409 @@
+"""
+Calendar Management System - API tests
+Exercises the REST API against a temporary database
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import app as calendar_app
+
+
+def event(title, start_time, end_time, timezone='UTC'):
+    """Build an event payload"""
+    return {'title': title, 'start_time': start_time, 'end_time': end_time, 'timezone': timezone}
+
+
+class CalendarTestCase(unittest.TestCase):
+    """Base case that points the app at a fresh temporary database"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.original_database = calendar_app.DATABASE
+        calendar_app.DATABASE = os.path.join(self.tmpdir.name, 'calendar.db')
+        self.client = calendar_app.app.test_client()
+
+    def tearDown(self):
+        calendar_app._close_all()
+        calendar_app._local.conn = None
+        calendar_app.DATABASE = self.original_database
+        self.tmpdir.cleanup()
+
+    def create(self, payload):
+        return self.client.post('/api/events', json=payload)
+
+
+class TimezoneTests(CalendarTestCase):
+    def setUp(self):
+        super().setUp()
+        calendar_app.init_db()
+
+    def test_rejects_non_string_timezones(self):
+        for timezone in [None, ['UTC'], 5]:
+            response = self.create(event('Odd tz', '2025-01-01T10:00:00', '2025-01-01T11:00:00', timezone))
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json(), {'error': f'Invalid timezone: {timezone}'})
+
+    def test_update_rejects_non_string_timezone(self):
+        self.create(event('Existing', '2025-01-01T10:00:00Z', '2025-01-01T11:00:00Z'))
+        for body in [{'timezone': None}, {'timezone': None, 'end_time': '2025-01-01T11:30:00Z'}]:
+            response = self.client.put('/api/events/1', json=body)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json(), {'error': 'Invalid timezone: None'})
+
+    def test_ambiguous_wall_time_resolves_to_standard_time(self):
+        # 01:30 happens twice on 2025-11-02 in New York; standard time (-05:00) is the second
+        response = self.create(event('Fall back', '2025-11-02T01:30:00', '2025-11-02T03:00:00', 'America/New_York'))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()['start_time'], '2025-11-02T01:30:00-05:00')
+        stored = self.client.get('/api/events?fields=utc').get_json()[0]
+        self.assertEqual(stored['start_time_utc'], '2025-11-02T06:30:00Z')
+
+    def test_skipped_wall_time_uses_offset_before_gap(self):
+        # 02:30 does not exist on 2025-03-09 in New York; it is read with the earlier -05:00
+        response = self.create(event('Spring forward', '2025-03-09T02:30:00', '2025-03-09T04:00:00', 'America/New_York'))
+        self.assertEqual(response.status_code, 201)
+        stored = self.client.get('/api/events?fields=utc').get_json()[0]
+        self.assertEqual(stored['start_time_utc'], '2025-03-09T07:30:00Z')
+
+    def test_range_bounds_localize_ambiguous_times(self):
+        self.create(event('Early', '2025-11-02T05:45:00Z', '2025-11-02T06:15:00Z'))
+        events = self.client.get('/api/events', query_string={
+            'start_date': '2025-11-02T01:30:00', 'timezone': 'America/New_York'
+        }).get_json()
+        self.assertEqual(events, [])
+
+
+class RangeQueryTests(CalendarTestCase):
+    def setUp(self):
+        super().setUp()
+        calendar_app.init_db()
+        self.create(event('Morning', '2025-01-06T09:00:00Z', '2025-01-06T10:00:00Z'))
+        self.create(event('Evening', '2025-01-12T23:00:00Z', '2025-01-13T00:00:00Z'))
+
+    def titles(self, **args):
+        return [e['title'] for e in self.client.get('/api/events', query_string=args).get_json()]
+
+    def test_creates_range_indexes(self):
+        indexes = {row['name'] for row in calendar_app.get_db().execute("PRAGMA index_list('events')")}
+        self.assertTrue({'idx_events_start_ts', 'idx_events_range'} <= indexes)
+
+    def test_connection_pragmas(self):
+        conn = calendar_app.get_db()
+        self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        self.assertEqual(conn.execute('PRAGMA synchronous').fetchone()[0], 1)  # NORMAL
+        self.assertEqual(conn.execute('PRAGMA temp_store').fetchone()[0], 2)  # MEMORY
+
+    def test_range_bounds_are_inclusive(self):
+        self.assertEqual(self.titles(start_date='2025-01-06T10:00:00Z'), ['Morning', 'Evening'])
+        self.assertEqual(self.titles(start_date='2025-01-06T10:00:00.000001Z'), ['Evening'])
+        self.assertEqual(self.titles(start_date='2025-01-06T09:30:00Z', end_date='2025-01-06T09:30:00Z'), ['Morning'])
+        self.assertEqual(self.titles(end_date='2025-01-06T09:00:00Z'), ['Morning'])
+        self.assertEqual(self.titles(end_date='2025-01-06T08:59:59Z'), [])
+
+    def test_week_includes_events_ending_at_its_start(self):
+        week = self.client.get('/api/events/week?start_date=2025-01-13').get_json()
+        self.assertEqual([e['title'] for e in week['events']], ['Evening'])
+        week = self.client.get('/api/events/week?start_date=2025-01-06').get_json()
+        self.assertEqual([e['title'] for e in week['events']], ['Morning', 'Evening'])
+
+
+class ConflictTests(CalendarTestCase):
+    def setUp(self):
+        super().setUp()
+        calendar_app.init_db()
+        response = self.create(event('Existing', '2025-01-01T10:00:00Z', '2025-01-01T11:00:00Z'))
+        self.assertEqual(response.status_code, 201)
+
+    def test_touching_intervals_do_not_conflict(self):
+        self.assertEqual(self.create(event('Before', '2025-01-01T09:00:00Z', '2025-01-01T10:00:00Z')).status_code, 201)
+        self.assertEqual(self.create(event('After', '2025-01-01T11:00:00Z', '2025-01-01T12:00:00Z')).status_code, 201)
+
+    def test_partial_overlaps_conflict(self):
+        for start, end in [('2025-01-01T09:30:00Z', '2025-01-01T10:30:00Z'),
+                           ('2025-01-01T10:30:00Z', '2025-01-01T11:30:00Z')]:
+            response = self.create(event('Overlap', start, end))
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual([c['title'] for c in response.get_json()['conflicts']], ['Existing'])
+
+    def test_identical_interval_conflicts(self):
+        self.assertEqual(self.create(event('Same', '2025-01-01T10:00:00Z', '2025-01-01T11:00:00Z')).status_code, 409)
+
+    def test_containment_conflicts_both_ways(self):
+        self.assertEqual(self.create(event('Inside', '2025-01-01T10:15:00Z', '2025-01-01T10:45:00Z')).status_code, 409)
+        self.assertEqual(self.create(event('Around', '2025-01-01T09:00:00Z', '2025-01-01T12:00:00Z')).status_code, 409)
+
+    def test_start_must_precede_end(self):
+        response = self.create(event('Empty', '2025-01-01T13:00:00Z', '2025-01-01T13:00:00Z'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_update_does_not_conflict_with_itself(self):
+        response = self.client.put('/api/events/1', json={'end_time': '2025-01-01T11:30:00Z', 'timezone': 'UTC'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['end_time'], '2025-01-01T11:30:00+00:00')
+
+    def test_update_conflicts_with_other_events(self):
+        self.create(event('Next', '2025-01-01T12:00:00Z', '2025-01-01T13:00:00Z'))
+        response = self.client.put('/api/events/1', json={'end_time': '2025-01-01T12:30:00Z'})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual([c['title'] for c in response.get_json()['conflicts']], ['Next'])
+
+
+class EventSerializationTests(CalendarTestCase):
+    def setUp(self):
+        super().setUp()
+        calendar_app.init_db()
+        self.create({**event('Summer', '2025-07-01T12:00:00.123456Z', '2025-07-01T13:00:00Z'), 'description': 'Notes'})
+        self.create(event('Winter', '2025-12-01T12:00:00Z', '2025-12-01T13:30:00Z'))
+
+    def events(self, **args):
+        return self.client.get('/api/events', query_string=args).get_json()
+
+    def test_times_formatted_in_requested_timezone(self):
+        summer, winter = self.events(timezone='America/New_York')
+        self.assertEqual(summer, {
+            'id': 1, 'title': 'Summer', 'description': 'Notes',
+            'start_time': '2025-07-01T08:00:00.123456-04:00', 'end_time': '2025-07-01T09:00:00-04:00',
+            'timezone': 'UTC', 'start_time_utc': '2025-07-01T12:00:00.123456Z', 'end_time_utc': '2025-07-01T13:00:00Z'
+        })
+        self.assertEqual((winter['start_time'], winter['end_time']),
+                         ('2025-12-01T07:00:00-05:00', '2025-12-01T08:30:00-05:00'))
+
+    def test_fractional_offsets(self):
+        summer, _ = self.events(timezone='Asia/Kathmandu')
+        self.assertEqual(summer['start_time'], '2025-07-01T17:45:00.123456+05:45')
+
+    def test_weekly_view_uses_the_same_formatting(self):
+        week = self.client.get('/api/events/week?start_date=2025-06-30&timezone=Europe/Berlin').get_json()
+        self.assertEqual(week['start_of_week'], '2025-06-30T00:00:00+02:00')
+        self.assertEqual([(e['start_time'], e['end_time']) for e in week['events']],
+                         [('2025-07-01T14:00:00.123456+02:00', '2025-07-01T15:00:00+02:00')])
+
+    def test_utc_view_matches_converted_times(self):
+        summer, winter = self.events()
+        self.assertEqual((summer['start_time'], summer['end_time']),
+                         ('2025-07-01T12:00:00.123456+00:00', '2025-07-01T13:00:00+00:00'))
+        self.assertEqual(self.events(timezone='UTC'), [summer, winter])
+        self.assertEqual(summer['start_time'], calendar_app._format_epoch(1751371200.123456, 'UTC'))
+
+    def test_utc_fields_only(self):
+        summer, winter = self.events(fields='utc', timezone='America/New_York')
+        self.assertEqual(summer, {
+            'id': 1, 'title': 'Summer', 'description': 'Notes', 'timezone': 'UTC',
+            'start_time_utc': '2025-07-01T12:00:00.123456Z', 'end_time_utc': '2025-07-01T13:00:00Z'
+        })
+        week = self.client.get('/api/events/week?start_date=2025-12-01&fields=utc').get_json()
+        self.assertEqual(week['events'], [winter])
+
+    def test_rejects_unknown_timezone(self):
+        response = self.client.get('/api/events?timezone=Nowhere/Land')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json(), {'error': 'Invalid timezone: Nowhere/Land'})
+
+
+class UpdateTests(CalendarTestCase):
+    def setUp(self):
+        super().setUp()
+        calendar_app.init_db()
+        self.create(event('Original', '2025-01-01T10:00:00.500000', '2025-01-01T11:00:00', 'Europe/Paris'))
+
+    def stored(self):
+        return dict(calendar_app.get_db().execute(
+            'SELECT title, description, timezone, start_time_utc, end_time_utc, start_ts, end_ts FROM events'
+        ).fetchone())
+
+    def test_title_only_update_keeps_stored_times(self):
+        before = self.stored()
+        response = self.client.put('/api/events/1', json={'title': 'Renamed', 'description': 'Moved rooms'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {
+            'id': 1, 'title': 'Renamed', 'description': 'Moved rooms',
+            'start_time': '2025-01-01T10:00:00.500000+01:00', 'end_time': '2025-01-01T11:00:00+01:00',
+            'timezone': 'Europe/Paris', 'message': 'Event updated successfully'
+        })
+        self.assertEqual(self.stored(), {**before, 'title': 'Renamed', 'description': 'Moved rooms'})
+
+    def test_timezone_only_update_reformats_response(self):
+        response = self.client.put('/api/events/1', json={'timezone': 'Asia/Tokyo'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.get_json()['start_time'], response.get_json()['end_time']),
+                         ('2025-01-01T18:00:00.500000+09:00', '2025-01-01T19:00:00+09:00'))
+        self.assertEqual(self.stored()['start_time_utc'], '2025-01-01T09:00:00.500000Z')
+
+    def test_time_update_keeps_the_unchanged_bound(self):
+        response = self.client.put('/api/events/1', json={'end_time': '2025-01-01T12:00:00'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['start_time'], '2025-01-01T10:00:00.500000+01:00')
+        self.assertEqual(self.stored()['end_ts'], 1735729200.0)
+
+    def test_update_missing_event(self):
+        self.assertEqual(self.client.put('/api/events/99', json={'title': 'Ghost'}).status_code, 404)
+
+
+class IndexPageTests(unittest.TestCase):
+    def setUp(self):
+        calendar_app._index_page.cache_clear()
+        self.client = calendar_app.app.test_client()
+
+    def asset_version(self, name):
+        with open(os.path.join(calendar_app.app.static_folder, name), 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()[:12]
+
+    def test_asset_urls_carry_content_hash(self):
+        body = self.client.get('/').data
+        self.assertIn(b'href="style.css?v=' + self.asset_version('style.css').encode() + b'"', body)
+        self.assertIn(b'src="script.js?v=' + self.asset_version('script.js').encode() + b'"', body)
+
+    def test_page_revalidates_with_etag(self):
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Cache-Control'], 'no-cache')
+        etag = response.headers['ETag']
+        cached = self.client.get('/', headers={'If-None-Match': etag})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.data, b'')
+        self.assertEqual(self.client.get('/', headers={'If-None-Match': '"stale"'}).status_code, 200)
+
+    def test_index_html_is_served_like_the_root(self):
+        root = self.client.get('/')
+        page = self.client.get('/index.html')
+        self.assertEqual(page.data, root.data)
+        self.assertEqual(page.headers['Cache-Control'], 'no-cache')
+        self.assertEqual(page.headers['ETag'], root.headers['ETag'])
+
+    def test_static_assets_cache_for_a_year(self):
+        response = self.client.get('/style.css')
+        self.assertEqual(response.headers['Cache-Control'], 'public, max-age=31536000')
+        response.close()
+
+
+class BulkCreateTests(CalendarTestCase):
+    def setUp(self):
+        super().setUp()
+        calendar_app.init_db()
+
+    def bulk(self, body):
+        return self.client.post('/api/events/bulk', json=body)
+
+    def stored_titles(self):
+        return [e['title'] for e in self.client.get('/api/events').get_json()]
+
+    def test_rejects_missing_or_empty_events(self):
+        for body in [{}, {'events': []}, {'events': 'nope'}, [event('A', '2025-01-01T10:00:00Z', '2025-01-01T11:00:00Z')]]:
+            self.assertEqual(self.bulk(body).status_code, 400)
+
+    def test_reports_index_of_invalid_event(self):
+        valid = event('Valid', '2025-01-01T10:00:00Z', '2025-01-01T11:00:00Z')
+        cases = [
+            ('not an object', 'Event must be an object'),
+            ({'title': 'No times'}, 'Missing required fields: title, start_time, end_time'),
+            (event('Bad tz', '2025-01-02T10:00:00', '2025-01-02T11:00:00', 'Nowhere/Land'), 'Invalid timezone: Nowhere/Land'),
+            (event('Null tz', '2025-01-02T10:00:00', '2025-01-02T11:00:00', None), 'Invalid timezone: None'),
+            (event('List tz', '2025-01-02T10:00:00', '2025-01-02T11:00:00', ['UTC']), "Invalid timezone: ['UTC']"),
+            (event('Backwards', '2025-01-02T11:00:00Z', '2025-01-02T10:00:00Z'), 'Start time must be before end time'),
+        ]
+        for item, message in cases:
+            response = self.bulk({'events': [valid, item]})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json(), {'error': message, 'index': 1})
+        self.assertEqual(self.stored_titles(), [])
+
+    def test_rejects_overlap_within_batch(self):
+        response = self.bulk({'events': [
+            event('A', '2025-01-01T10:00:00Z', '2025-01-01T12:00:00Z'),
+            event('B', '2025-01-01T13:00:00Z', '2025-01-01T14:00:00Z'),
+            event('C', '2025-01-01T11:00:00Z', '2025-01-01T11:30:00Z'),
+        ]})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.get_json()['index'], 2)
+        self.assertEqual(response.get_json()['conflicts_with_index'], 0)
+        self.assertEqual(self.stored_titles(), [])
+
+    def test_rejects_conflict_with_stored_event(self):
+        self.create(event('Stored', '2025-01-01T10:00:00Z', '2025-01-01T11:00:00Z'))
+        response = self.bulk({'events': [
+            event('Free', '2025-01-02T10:00:00Z', '2025-01-02T11:00:00Z'),
+            event('Clash', '2025-01-01T10:30:00Z', '2025-01-01T10:45:00Z'),
+        ]})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.get_json()['index'], 1)
+        self.assertEqual([c['title'] for c in response.get_json()['conflicts']], ['Stored'])
+        self.assertEqual(self.stored_titles(), ['Stored'])
+
+    def test_returns_contiguous_ids(self):
+        self.create(event('First', '2025-01-01T08:00:00Z', '2025-01-01T09:00:00Z'))
+        response = self.bulk({'events': [
+            event('A', '2025-01-01T10:00:00Z', '2025-01-01T11:00:00Z'),
+            event('B', '2025-01-01T17:30:00', '2025-01-01T18:30:00', 'Asia/Kolkata'),
+            event('C', '2025-01-01T13:00:00Z', '2025-01-01T14:00:00Z'),
+        ]})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()['ids'], [2, 3, 4])
+        events = {e['id']: e['title'] for e in self.client.get('/api/events').get_json()}
+        self.assertEqual(events, {1: 'First', 2: 'A', 3: 'B', 4: 'C'})
+
+
+class EpochColumnTests(CalendarTestCase):
+    def setUp(self):
+        super().setUp()
+        calendar_app.init_db()
+
+    def test_epoch_columns_keep_fractional_seconds(self):
+        self.create(event('Precise', '2025-01-01T10:00:00.250000Z', '2025-01-01T11:00:00.999999Z'))
+        row = calendar_app.get_db().execute('SELECT start_ts, end_ts, start_time_utc, end_time_utc FROM events').fetchone()
+        self.assertEqual(tuple(row), (1735725600.25, 1735729200.999999,
+                                      '2025-01-01T10:00:00.250000Z', '2025-01-01T11:00:00.999999Z'))
+
+    def test_sub_second_overlap_conflicts(self):
+        self.assertEqual(self.create(event('Tail', '2025-01-01T11:00:00Z', '2025-01-01T12:00:00.500000Z')).status_code, 201)
+        response = self.create(event('Late', '2025-01-01T12:00:00.200000Z', '2025-01-01T13:00:00Z'))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual([c['title'] for c in response.get_json()['conflicts']], ['Tail'])
+        touching = self.create(event('Touching', '2025-01-01T12:00:00.500000Z', '2025-01-01T13:00:00Z'))
+        self.assertEqual(touching.status_code, 201)
+
+
+class MigrationTests(CalendarTestCase):
+    def setUp(self):
+        super().setUp()
+        # Schema as it was before the epoch-second columns existed
+        conn = sqlite3.connect(calendar_app.DATABASE)
+        conn.execute('''
+            CREATE TABLE events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                description TEXT,
+                start_time_utc TEXT NOT NULL,
+                end_time_utc TEXT NOT NULL,
+                timezone TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        ''')
+        conn.execute('''
+            INSERT INTO events (title, description, start_time_utc, end_time_utc, timezone, created_at)
+            VALUES ('Legacy', '', '2025-01-01T10:00:00Z', '2025-01-01T11:00:00.999999Z', 'UTC', '2024-12-31T09:00:00.999999Z')
+        ''')
+        conn.commit()
+        conn.close()
+
+    def test_backfills_epoch_columns(self):
+        calendar_app.init_db()
+        calendar_app.init_db()  # idempotent on an already migrated database
+        row = calendar_app.get_db().execute('SELECT start_ts, end_ts, created_ts FROM events').fetchone()
+        self.assertEqual(tuple(row), (1735725600.0, 1735729200.999999, 1735635600.999999))
+
+    def test_migrated_rows_are_queried_and_conflict_checked(self):
+        calendar_app.init_db()
+        events = self.client.get('/api/events?timezone=America/New_York').get_json()
+        self.assertEqual(events[0]['title'], 'Legacy')
+        self.assertEqual(events[0]['end_time'], '2025-01-01T06:00:00.999999-05:00')
+        response = self.create(event('Late', '2025-01-01T11:00:00.500000Z', '2025-01-01T12:00:00Z'))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.create(event('After', '2025-01-01T11:00:00.999999Z', '2025-01-01T12:00:00Z')).status_code, 201)
+
+
+if __name__ == '__main__':
+    unittest.main()
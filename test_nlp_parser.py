@@ -0,0 +1,156 @@
+"""
+Calendar Management System - natural language parser tests
+Parses against a fixed clock so relative dates are deterministic
+"""
+
+from datetime import datetime, timezone
+import unittest
+from unittest import mock
+
+import nlp_parser
+
+
+def clock(utc_now):
+    """datetime subclass whose now() is the given instant"""
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return utc_now.astimezone(tz)
+    return Clock
+
+# Wednesday 2025-01-15 09:00 UTC
+FixedDatetime = clock(datetime(2025, 1, 15, 9, 0, tzinfo=timezone.utc))
+
+
+class ParserTestCase(unittest.TestCase):
+    def setUp(self):
+        self.use_clock(FixedDatetime)
+
+    def use_clock(self, clock_class):
+        patcher = mock.patch('nlp_parser.datetime', clock_class)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def parse(self, text, timezone='UTC'):
+        return nlp_parser.format_parsed_result(nlp_parser.parse_natural_language(text, timezone))
+
+    def start_date(self, text):
+        return self.parse(text)['start_date']
+
+
+class BaselineParityTests(ParserTestCase):
+    # Output of the original, uncompiled parser for the same clock, quirks included
+    # (an explicit duration leaves end_time equal to start_time)
+    CASES = [
+        ('Meeting tomorrow at 2pm', ('Meeting', '2025-01-16', '14:00', '2025-01-16', '15:00', 0.6)),
+        ('Lunch with John next Friday at 12:30', ('Lunch With John', '2025-01-17', '12:30', '2025-01-17', '13:30', 0.6)),
+        ('Call client on Dec 30 at 3pm', ('Call Client', '2025-12-30', '15:00', '2025-12-30', '16:00', 0.7)),
+        ('Team standup every day at 9am', ('Team Standup Every Day', '2025-01-15', '09:00', '2025-01-15', '10:00', 0.4)),
+        ('Dentist appointment next Monday at 10:30am', ('Dentist Appointment', '2025-01-20', '10:30', '2025-01-20', '11:30', 0.6)),
+        ('Review 12/30 at 14:30 for 2 hours', ('Review 12/30', '2025-12-30', '14:30', '2025-12-30', '14:30', 0.9)),
+        ('Sync 1/10 at 9am', ('Sync 1/10', '2026-01-10', '09:00', '2026-01-10', '10:00', 0.7)),
+        ('Workshop 30 jan at 10am for 90 min', ('Workshop 30 Jan', '2025-01-30', '10:00', '2025-01-30', '10:00', 0.9)),
+        ('Coffee today at 12 am', ('Coffee', '2025-01-15', '00:00', '2025-01-15', '01:00', 0.6)),
+        ('Gym at 7', ('Gym', '2025-01-15', '19:00', '2025-01-15', '20:00', 0.4)),
+        ('Retro next week for 45 minutes', ('Retro', '2025-01-20', '14:00', '2025-01-20', '14:00', 0.5)),
+        ('Planning 2/30 at 5pm', ('Planning 2/30', '2025-01-15', '17:00', '2025-01-15', '18:00', 0.4)),
+        ('Demo at 11:45pm for 1 hr', ('Demo', '2025-01-15', '23:45', '2025-01-15', '23:45', 0.6)),
+        ('Quick chat 15 min', ('Quick Chat 15 Min', '2025-01-15', '15:00', '2025-01-15', '15:00', 0.6)),
+        ('Standup', ('Standup', '2025-01-15', '14:00', '2025-01-15', '15:00', 0.2)),
+    ]
+
+    def test_matches_baseline_output(self):
+        keys = ('title', 'start_date', 'start_time', 'end_date', 'end_time', 'confidence')
+        for text, expected in self.CASES:
+            self.assertEqual(self.parse(text), dict(zip(keys, expected)), text)
+
+
+class NextWeekdayTests(ParserTestCase):
+    def test_full_weekday_names(self):
+        self.assertEqual(self.start_date('standup next monday at 9am'), '2025-01-20')
+        self.assertEqual(self.start_date('lunch next friday at 12:30'), '2025-01-17')
+        self.assertEqual(self.start_date('review next wednesday'), '2025-01-22')
+
+    def test_plural_weekdays_match_like_substrings(self):
+        self.assertEqual(self.start_date('standup next mondays'), '2025-01-20')
+        parsed = self.parse('next fridays at 3')
+        self.assertEqual(parsed['start_date'], '2025-01-17')
+        self.assertEqual(parsed['confidence'], 0.6)
+
+    def test_abbreviated_weekdays(self):
+        for text, expected in [('call next mon', '2025-01-20'), ('call next tues', '2025-01-21'),
+                               ('call next thurs at 4pm', '2025-01-16'), ('call next sun', '2025-01-19')]:
+            self.assertEqual(self.start_date(text), expected, text)
+
+    def test_abbreviations_need_a_word_boundary(self):
+        for text in ['plan next month', 'next sunny day', 'next weds party', 'next fried rice']:
+            parsed = self.parse(text)
+            self.assertEqual(parsed['start_date'], '2025-01-15', text)
+            self.assertEqual(parsed['confidence'], 0.2, text)
+
+    def test_earliest_weekday_wins_when_several_are_named(self):
+        self.assertEqual(self.start_date('next friday or next tuesday'), '2025-01-21')
+
+    def test_needs_a_single_space_after_next(self):
+        self.assertEqual(self.start_date('next  monday'), '2025-01-15')
+        self.assertEqual(self.start_date('next\nmonday'), '2025-01-15')
+
+
+class DateKeywordTests(ParserTestCase):
+    def test_keywords_apply_in_priority_order_not_text_order(self):
+        self.assertEqual(self.start_date('next monday or tomorrow or today'), '2025-01-15')
+        self.assertEqual(self.start_date('next friday, maybe tomorrow'), '2025-01-16')
+        self.assertEqual(self.start_date('next tuesday or next week'), '2025-01-20')
+
+    def test_keywords_match_inside_words(self):
+        self.assertEqual(self.start_date("todays review"), '2025-01-15')
+        self.assertEqual(self.start_date("plan for tomorrows demo"), '2025-01-16')
+        self.assertEqual(self.start_date('offsite next weekend'), '2025-01-20')
+
+    def test_next_week_needs_a_single_space(self):
+        parsed = self.parse('retro next  week')
+        self.assertEqual(parsed['start_date'], '2025-01-15')
+        self.assertEqual(parsed['confidence'], 0.2)
+
+
+class ParseCacheTests(ParserTestCase):
+    def test_relative_dates_roll_over_at_local_midnight(self):
+        self.assertEqual(self.start_date('review tomorrow'), '2025-01-16')
+        self.use_clock(clock(datetime(2025, 1, 16, 0, 0, tzinfo=timezone.utc)))
+        self.assertEqual(self.start_date('review tomorrow'), '2025-01-17')
+
+    def test_today_follows_the_requested_timezone(self):
+        late = clock(datetime(2025, 1, 15, 20, 0, tzinfo=timezone.utc))
+        self.use_clock(late)
+        self.assertEqual(self.parse('review today', 'UTC')['start_date'], '2025-01-15')
+        self.assertEqual(self.parse('review today', 'Asia/Tokyo')['start_date'], '2025-01-16')
+        self.assertEqual(self.parse('review today', 'Pacific/Honolulu')['start_date'], '2025-01-15')
+
+    def test_repeat_parses_are_cached_and_independent(self):
+        nlp_parser._parse_natural_language.cache_clear()
+        first = nlp_parser.parse_natural_language('  Sync tomorrow at 3pm ')
+        first['title'] = 'changed'
+        second = nlp_parser.parse_natural_language('sync TOMORROW at 3pm')
+        self.assertEqual(second['title'], 'sync')
+        self.assertEqual(nlp_parser._parse_natural_language.cache_info().hits, 1)
+
+
+class TitleTests(ParserTestCase):
+    def test_title_is_text_before_first_keyword(self):
+        for text, title in [('Board meeting tomorrow', 'Board Meeting'), ('Call mom at 5 at home', 'Call Mom'),
+                            ('lunch from noon until 1', 'Lunch'), ('meeting  today', 'Meeting'),
+                            ('xtomorrow party', 'Xtomorrow Party'), ('at 5pm', 'At 5Pm')]:
+            self.assertEqual(self.parse(text)['title'], title, text)
+
+    def test_multi_line_text_falls_back_to_text_before_at(self):
+        self.assertEqual(self.parse('Project sync\nwith the team tomorrow at 3pm')['title'],
+                         'Project Sync\nWith The Team Tomorrow')
+        self.assertEqual(self.parse('Notes\nline two')['title'], 'Notes\nLine Two')
+
+    def test_title_cased_only_for_display(self):
+        self.assertEqual(nlp_parser.parse_natural_language('Board Meeting tomorrow')['title'], 'board meeting')
+        self.assertEqual(self.parse('   ')['title'], 'Untitled Event')
+
+
+if __name__ == '__main__':
+    unittest.main()
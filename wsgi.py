@@ -0,0 +1,10 @@
+"""
+Calendar Management System - WSGI entry point
+Initializes the database and exposes the Flask app to production servers
+"""
+
+from app import app, init_db
+
+init_db()
+
+application = app